@@ -0,0 +1,221 @@
+import argparse
+import json
+import os
+import random
+import shutil
+import tempfile
+import time
+
+from extractor_html import (
+    CAMPOS_PRINCIPALES,
+    ETIQUETA_FIN_SOAT,
+    XPATH_CARD_SOAT,
+    extraer_archivo,
+    extraer_campos,
+    extraer_fecha_soat,
+    iterar_lineas,
+    limpiar_documento,
+    lineas_texto,
+    listar_html,
+    procesar_lote,
+)
+from scraper_runt import buscar_valor, extraer_valor_soat
+
+
+PANELES_RELLENO = [
+    'Datos técnicos', 'Certificado de revisión técnico mecánica', 'Limitaciones a la propiedad',
+    'Garantías a favor de', 'Tarjeta de registro', 'Información de blindaje', 'Solicitudes'
+]
+
+
+def generar_html(placa, semilla=0, paneles_relleno=20):
+    """Genera una página con la estructura Angular Material de la consulta del RUNT"""
+    aleatorio = random.Random(semilla)
+    campos = [
+        ('PLACA DEL VEHÍCULO:', placa),
+        ('NRO. DE LICENCIA DE TRÁNSITO:', str(aleatorio.randint(10**9, 10**10))),
+        ('ESTADO DEL VEHÍCULO:', aleatorio.choice(['ACTIVO', 'INACTIVO'])),
+        ('TIPO DE SERVICIO:', aleatorio.choice(['Particular', 'Público'])),
+        ('CLASE DE VEHÍCULO:', aleatorio.choice(['AUTOMOVIL', 'CAMIONETA', 'MOTOCICLETA'])),
+        ('MARCA:', aleatorio.choice(['RENAULT', 'CHEVROLET', 'MAZDA', 'KIA'])),
+        ('LÍNEA:', 'LOGAN'),
+        ('MODELO:', str(aleatorio.randint(2000, 2025))),
+        ('GRAVAMENES A LA PROPIEDAD:', aleatorio.choice(['NO', 'SI'])),
+    ]
+    filas = ''.join(
+        f'<div class="mat-row ng-star-inserted"><label class="etiqueta">{etiqueta}</label>'
+        f'<div class="valor">{valor}</div></div>'
+        for etiqueta, valor in campos
+    )
+    relleno = ''.join(
+        f'<mat-expansion-panel class="ng-star-inserted"><mat-expansion-panel-header aria-expanded="false">'
+        f'<mat-panel-title>{aleatorio.choice(PANELES_RELLENO)} {i}</mat-panel-title></mat-expansion-panel-header>'
+        f'<div class="mat-expansion-panel-body">'
+        + ''.join(f'<div><span>Dato {j}:</span><span>{aleatorio.randint(0, 99999)}</span></div>' for j in range(15))
+        + '</div></mat-expansion-panel>'
+        for i in range(paneles_relleno)
+    )
+    fecha_fin = f"{aleatorio.randint(1, 28):02d}/{aleatorio.randint(1, 12):02d}/{aleatorio.randint(2024, 2027)}"
+    soat = (
+        '<mat-expansion-panel><mat-expansion-panel-header aria-expanded="true">'
+        '<mat-icon>credit_card</mat-icon><mat-panel-title>Póliza SOAT</mat-panel-title>'
+        '</mat-expansion-panel-header><mat-card><mat-card-title>Póliza SOAT</mat-card-title>'
+        '<mat-card-content><p>Número de póliza: 123456</p><p>Fecha expedición: 01/01/2024</p>'
+        f'<p>{ETIQUETA_FIN_SOAT} {fecha_fin}</p><p>Entidad expide SOAT: SEGUROS</p>'
+        '</mat-card-content></mat-card></mat-expansion-panel>'
+    )
+    return (
+        '<html><head><title>RUNT</title><style>.mat-row{display:flex}</style>'
+        '<script>window.ng = {};</script></head><body><app-root>'
+        f'<mat-card><mat-card-title>Información general del vehículo</mat-card-title>{filas}</mat-card>'
+        f'{relleno}{soat}</app-root></body></html>'
+    )
+
+
+def generar_fixtures(carpeta, cantidad):
+    """Escribe `cantidad` páginas de prueba en la carpeta"""
+    os.makedirs(carpeta, exist_ok=True)
+    for i in range(cantidad):
+        placa = f"{chr(65 + i % 26)}{chr(65 + i // 26 % 26)}{chr(65 + i // 676 % 26)}{i % 1000:03d}"
+        with open(os.path.join(carpeta, f"{placa}.html"), 'w', encoding='utf-8') as f:
+            f.write(generar_html(placa, semilla=i))
+    return listar_html(carpeta)
+
+
+def extraer_por_lineas(documento):
+    """Heurística actual de extraer_resultados: un recorrido de líneas por cada etiqueta"""
+    lineas = lineas_texto(documento.find('body'))
+    datos = {campo: buscar_valor(lineas, etiqueta) for campo, etiqueta in CAMPOS_PRINCIPALES}
+    cards_soat = documento.xpath(XPATH_CARD_SOAT)
+    lineas_soat = lineas_texto(cards_soat[0]) if cards_soat else []
+    datos['soat_fecha_fin_vigencia'] = extraer_valor_soat(lineas_soat, ETIQUETA_FIN_SOAT)
+    return datos
+
+
+def extraer_una_pasada(documento):
+    """Extractor de extractor_html: una sola pasada para todas las etiquetas"""
+    datos = extraer_campos(iterar_lineas(documento.find('body')))
+    cards_soat = documento.xpath(XPATH_CARD_SOAT)
+    datos['soat_fecha_fin_vigencia'] = extraer_fecha_soat(lineas_texto(cards_soat[0])) if cards_soat else None
+    return datos
+
+
+def comparar_con_consultas(rutas, archivo_json):
+    """
+    Compara lo extraído de cada HTML con lo que guardó la consulta en vivo
+    (resultados_runt.json). Los HTML se asocian por placa: guardar_html los
+    nombra PLACA_fecha.html. El JSON solo guarda la última consulta de cada
+    placa, así que se compara únicamente el HTML más reciente de cada una
+    (las rutas ordenadas quedan en orden de fecha).
+    """
+    with open(archivo_json, 'r', encoding='utf-8') as f:
+        consultas = {r['placa'].upper(): r for r in json.load(f) if r.get('placa')}
+
+    campos = [campo for campo, _ in CAMPOS_PRINCIPALES] + ['soat_fecha_fin_vigencia']
+    coincidencias = {campo: 0 for campo in campos}
+    paginas = iguales = 0
+
+    ultimas = {}
+    for ruta in sorted(rutas):
+        ultimas[os.path.basename(ruta).split('_')[0].upper()] = ruta
+
+    for placa, ruta in ultimas.items():
+        if placa not in consultas:
+            continue
+        paginas += 1
+        extraido = extraer_archivo(ruta)
+        distintos = [c for c in campos if extraido.get(c) != consultas[placa].get(c)]
+        for campo in campos:
+            if campo not in distintos:
+                coincidencias[campo] += 1
+        if distintos:
+            print(f"  [WARNING] {os.path.basename(ruta)}: distinto en {', '.join(distintos)}")
+        else:
+            iguales += 1
+
+    print(f"  {'Páginas con consulta en vivo':40s}: {paginas:8d}")
+    print(f"  {'Páginas idénticas a la consulta':40s}: {iguales:8d}")
+    for campo in campos:
+        print(f"    {campo:38s}: {coincidencias[campo]:8d}")
+
+
+def medir(nombre, funcion, elementos, repeticiones):
+    """Mide el mejor tiempo de `repeticiones` corridas y lo imprime por elemento"""
+    mejor = None
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        for elemento in elementos:
+            funcion(elemento)
+        duracion = time.perf_counter() - inicio
+        mejor = duracion if mejor is None else min(mejor, duracion)
+    print(f"  {nombre:40s}: {mejor * 1000 / len(elementos):8.3f} ms/página  ({mejor:.3f} s total)")
+    return mejor
+
+
+def main():
+    """Compara la heurística por líneas con el extractor lxml sobre HTML guardados"""
+    parser = argparse.ArgumentParser(description="Benchmark del extractor de HTML")
+    parser.add_argument('--carpeta', help="Carpeta con HTML guardados (por defecto se generan)")
+    parser.add_argument('--cantidad', type=int, default=1000, help="Páginas a generar")
+    parser.add_argument('--repeticiones', type=int, default=3)
+    parser.add_argument('--procesos', type=int, default=None)
+    parser.add_argument('--resultados', help="JSON de las consultas en vivo de esos HTML (resultados_runt.json)")
+    args = parser.parse_args()
+
+    carpeta_temporal = None
+    if args.carpeta:
+        rutas = listar_html(args.carpeta)
+    else:
+        carpeta_temporal = tempfile.mkdtemp(prefix='runt_html_')
+        rutas = generar_fixtures(carpeta_temporal, args.cantidad)
+
+    if not rutas:
+        print("[ERROR] No hay archivos .html")
+        return
+
+    try:
+        print(f"[INFO] {len(rutas)} página(s) HTML")
+        contenidos = []
+        for ruta in rutas:
+            with open(ruta, 'rb') as f:
+                contenidos.append(f.read())
+
+        print("\nEXTRACCIÓN POR PÁGINA:")
+        print("-" * 70)
+        medir('Parseo lxml', limpiar_documento, contenidos, args.repeticiones)
+        documentos = [limpiar_documento(contenido) for contenido in contenidos]
+        t_lineas = medir('Heurística por líneas (buscar_valor)', extraer_por_lineas, documentos, args.repeticiones)
+        t_pasada = medir('Extractor de una pasada', extraer_una_pasada, documentos, args.repeticiones)
+        print(f"  {'Aceleración':40s}: {t_lineas / t_pasada:8.2f}x")
+
+        # Ambos recorren las mismas líneas de lxml: solo compara los dos recorridos entre sí
+        diferencias = sum(1 for d in documentos if extraer_por_lineas(d) != extraer_una_pasada(d))
+        sin_placa = sum(1 for d in documentos if not extraer_una_pasada(d)['placa'])
+        print(f"  {'Distintos entre recorridos (no en vivo)':40s}: {diferencias:8d}")
+        print(f"  {'Páginas sin placa':40s}: {sin_placa:8d}")
+
+        if args.resultados:
+            print("\nCOMPARACIÓN CON LAS CONSULTAS EN VIVO:")
+            print("-" * 70)
+            comparar_con_consultas(rutas, args.resultados)
+
+        print("\nLOTE COMPLETO (lectura + parseo + extracción):")
+        print("-" * 70)
+        inicio = time.perf_counter()
+        for ruta in rutas:
+            extraer_archivo(ruta)
+        secuencial = time.perf_counter() - inicio
+        print(f"  {'Secuencial':40s}: {len(rutas) / secuencial:8.1f} páginas/s")
+
+        inicio = time.perf_counter()
+        procesar_lote(rutas, procesos=args.procesos)
+        paralelo = time.perf_counter() - inicio
+        print(f"  {'Pool de procesos':40s}: {len(rutas) / paralelo:8.1f} páginas/s")
+        print("-" * 70)
+    finally:
+        if carpeta_temporal:
+            shutil.rmtree(carpeta_temporal, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
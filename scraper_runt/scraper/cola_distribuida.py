@@ -0,0 +1,652 @@
+import argparse
+import hmac
+import json
+import multiprocessing
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import requests
+
+
+# Interfaces donde ServidorCola puede escuchar sin token
+HOSTS_LOCALES = ('127.0.0.1', 'localhost', '::1')
+
+
+class ColaTrabajos(ABC):
+    """
+    Interfaz de la cola de trabajos compartida entre nodos.
+
+    Cada trabajo es un par (placa, documento). Un trabajador reserva un
+    trabajo por un tiempo de visibilidad (lease); mientras lo procesa debe
+    renovarlo con latidos. Si el lease vence sin completarse, el trabajo
+    vuelve a quedar pendiente para otro trabajador.
+    """
+
+    @abstractmethod
+    def encolar(self, placa, documento):
+        """Agrega un trabajo a la cola. Retorna True si era nuevo"""
+
+    @abstractmethod
+    def reservar(self, trabajador, visibilidad):
+        """Reserva el siguiente trabajo pendiente o retorna None"""
+
+    @abstractmethod
+    def latido(self, trabajo_id, trabajador, visibilidad):
+        """Renueva el lease. Retorna False si el trabajo ya no es del trabajador"""
+
+    @abstractmethod
+    def completar(self, trabajo_id, trabajador, datos):
+        """Guarda el resultado y marca el trabajo como completado"""
+
+    @abstractmethod
+    def fallar(self, trabajo_id, trabajador, error):
+        """Libera el trabajo para reintento o lo marca como fallido"""
+
+    @abstractmethod
+    def liberar(self, trabajo_id, trabajador):
+        """Devuelve el trabajo a la cola sin contar el intento (interrupción)"""
+
+    @abstractmethod
+    def resumen(self):
+        """Retorna la cantidad de trabajos por estado"""
+
+    @abstractmethod
+    def resultados(self):
+        """Retorna la lista de resultados almacenados"""
+
+
+class ColaSQLite(ColaTrabajos):
+    """
+    Cola sobre un archivo SQLite local.
+
+    No necesita servicios externos, pero solo sirve para varios procesos de
+    la misma máquina: el modo WAL usa memoria compartida y los leases se
+    comparan con el reloj local, así que el archivo no debe compartirse por
+    red. Para varios nodos se expone con ServidorCola y se usa ColaHTTP.
+    """
+
+    def __init__(self, ruta_db, max_intentos=3):
+        self.ruta_db = ruta_db
+        self.max_intentos = max_intentos
+        self._local = threading.local()
+        self._crear_tablas()
+
+    def _conectar(self):
+        """Abre una conexión por hilo y proceso (no se comparten tras un fork)"""
+        if getattr(self._local, 'pid', None) != os.getpid():
+            conexion = sqlite3.connect(self.ruta_db, timeout=30, isolation_level=None)
+            conexion.row_factory = sqlite3.Row
+            conexion.execute("PRAGMA journal_mode=WAL")
+            self._local.conexion = conexion
+            self._local.pid = os.getpid()
+        return self._local.conexion
+
+    def _transaccion(self, operacion):
+        """Ejecuta una operación dentro de una transacción con bloqueo de escritura"""
+        conexion = self._conectar()
+        conexion.execute("BEGIN IMMEDIATE")
+        try:
+            resultado = operacion(conexion)
+            conexion.execute("COMMIT")
+            return resultado
+        except Exception:
+            conexion.execute("ROLLBACK")
+            raise
+
+    def _crear_tablas(self):
+        conexion = self._conectar()
+        conexion.executescript("""
+            CREATE TABLE IF NOT EXISTS trabajos (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                placa TEXT NOT NULL,
+                documento TEXT NOT NULL,
+                estado TEXT NOT NULL DEFAULT 'pendiente',
+                intentos INTEGER NOT NULL DEFAULT 0,
+                trabajador TEXT,
+                lease_hasta REAL,
+                error TEXT,
+                actualizado TEXT,
+                UNIQUE (placa, documento)
+            );
+            CREATE INDEX IF NOT EXISTS idx_trabajos_estado ON trabajos (estado, lease_hasta);
+            CREATE TABLE IF NOT EXISTS resultados (
+                trabajo_id INTEGER PRIMARY KEY,
+                placa TEXT NOT NULL,
+                documento TEXT NOT NULL,
+                trabajador TEXT,
+                datos TEXT NOT NULL,
+                fecha TEXT NOT NULL
+            );
+        """)
+
+    def _reencolar_vencidos(self, conexion):
+        """Devuelve a la cola los trabajos cuyo lease venció (trabajador caído)"""
+        ahora = time.time()
+        conexion.execute(
+            "UPDATE trabajos SET estado = 'fallido', trabajador = NULL, lease_hasta = NULL, "
+            "error = 'Lease vencido', actualizado = ? "
+            "WHERE estado = 'en_proceso' AND lease_hasta < ? AND intentos >= ?",
+            (self._fecha(), ahora, self.max_intentos)
+        )
+        cursor = conexion.execute(
+            "UPDATE trabajos SET estado = 'pendiente', trabajador = NULL, lease_hasta = NULL, "
+            "actualizado = ? "
+            "WHERE estado = 'en_proceso' AND lease_hasta < ?",
+            (self._fecha(), ahora)
+        )
+        if cursor.rowcount:
+            print(f"[WARNING] {cursor.rowcount} trabajo(s) reencolado(s) por lease vencido")
+
+    def _fecha(self):
+        return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    def encolar(self, placa, documento):
+        def operacion(conexion):
+            cursor = conexion.execute(
+                "INSERT OR IGNORE INTO trabajos (placa, documento, actualizado) VALUES (?, ?, ?)",
+                (placa.upper(), str(documento), self._fecha())
+            )
+            return cursor.rowcount == 1
+        return self._transaccion(operacion)
+
+    def reservar(self, trabajador, visibilidad):
+        def operacion(conexion):
+            self._reencolar_vencidos(conexion)
+            fila = conexion.execute(
+                "SELECT id, placa, documento, intentos FROM trabajos "
+                "WHERE estado = 'pendiente' ORDER BY id LIMIT 1"
+            ).fetchone()
+            if fila is None:
+                return None
+            conexion.execute(
+                "UPDATE trabajos SET estado = 'en_proceso', trabajador = ?, lease_hasta = ?, "
+                "intentos = intentos + 1, actualizado = ? WHERE id = ?",
+                (trabajador, time.time() + visibilidad, self._fecha(), fila['id'])
+            )
+            return {
+                'id': fila['id'],
+                'placa': fila['placa'],
+                'documento': fila['documento'],
+                'intento': fila['intentos'] + 1
+            }
+        return self._transaccion(operacion)
+
+    def latido(self, trabajo_id, trabajador, visibilidad):
+        def operacion(conexion):
+            cursor = conexion.execute(
+                "UPDATE trabajos SET lease_hasta = ?, actualizado = ? "
+                "WHERE id = ? AND trabajador = ? AND estado = 'en_proceso'",
+                (time.time() + visibilidad, self._fecha(), trabajo_id, trabajador)
+            )
+            return cursor.rowcount == 1
+        return self._transaccion(operacion)
+
+    def completar(self, trabajo_id, trabajador, datos):
+        def operacion(conexion):
+            fila = conexion.execute(
+                "SELECT placa, documento FROM trabajos "
+                "WHERE id = ? AND trabajador = ? AND estado = 'en_proceso'",
+                (trabajo_id, trabajador)
+            ).fetchone()
+            if fila is None:
+                return False
+            conexion.execute(
+                "INSERT OR REPLACE INTO resultados (trabajo_id, placa, documento, trabajador, datos, fecha) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (trabajo_id, fila['placa'], fila['documento'], trabajador,
+                 json.dumps(datos, ensure_ascii=False), self._fecha())
+            )
+            conexion.execute(
+                "UPDATE trabajos SET estado = 'completado', lease_hasta = NULL, error = NULL, "
+                "actualizado = ? WHERE id = ?",
+                (self._fecha(), trabajo_id)
+            )
+            return True
+        return self._transaccion(operacion)
+
+    def fallar(self, trabajo_id, trabajador, error):
+        def operacion(conexion):
+            cursor = conexion.execute(
+                "UPDATE trabajos SET "
+                "estado = CASE WHEN intentos >= ? THEN 'fallido' ELSE 'pendiente' END, "
+                "trabajador = NULL, lease_hasta = NULL, error = ?, actualizado = ? "
+                "WHERE id = ? AND trabajador = ? AND estado = 'en_proceso'",
+                (self.max_intentos, str(error), self._fecha(), trabajo_id, trabajador)
+            )
+            return cursor.rowcount == 1
+        return self._transaccion(operacion)
+
+    def liberar(self, trabajo_id, trabajador):
+        def operacion(conexion):
+            cursor = conexion.execute(
+                "UPDATE trabajos SET estado = 'pendiente', intentos = MAX(intentos - 1, 0), "
+                "trabajador = NULL, lease_hasta = NULL, actualizado = ? "
+                "WHERE id = ? AND trabajador = ? AND estado = 'en_proceso'",
+                (self._fecha(), trabajo_id, trabajador)
+            )
+            return cursor.rowcount == 1
+        return self._transaccion(operacion)
+
+    def resumen(self):
+        filas = self._conectar().execute(
+            "SELECT estado, COUNT(*) AS total FROM trabajos GROUP BY estado"
+        ).fetchall()
+        return {fila['estado']: fila['total'] for fila in filas}
+
+    def resultados(self):
+        filas = self._conectar().execute(
+            "SELECT datos FROM resultados ORDER BY trabajo_id"
+        ).fetchall()
+        return [json.loads(fila['datos']) for fila in filas]
+
+
+class ServidorCola:
+    """
+    Expone una ColaSQLite por HTTP para que trabajadores de otros nodos la
+    usen con ColaHTTP. Solo este proceso toca el archivo SQLite, así que los
+    leases se miden con un único reloj.
+
+    La cola contiene números de documento: si se configura un token, cada
+    petición debe enviarlo en el encabezado X-Token-Cola.
+    """
+
+    METODOS = ('encolar', 'reservar', 'latido', 'completar', 'fallar', 'liberar', 'resumen', 'resultados')
+    ENCABEZADO_TOKEN = 'X-Token-Cola'
+
+    def __init__(self, cola, host='127.0.0.1', puerto=8765, token=None):
+        cola_servida = cola
+        token_esperado = token.encode('utf-8') if token else None
+
+        class Manejador(BaseHTTPRequestHandler):
+            def do_POST(self):
+                if token_esperado is not None:
+                    recibido = self.headers.get(ServidorCola.ENCABEZADO_TOKEN, '').encode('utf-8')
+                    if not hmac.compare_digest(recibido, token_esperado):
+                        self._responder(401, {'error': "No autorizado"})
+                        return
+
+                metodo = self.path.strip('/')
+                if metodo not in ServidorCola.METODOS:
+                    self._responder(404, {'error': f"Método desconocido: {metodo}"})
+                    return
+                try:
+                    longitud = int(self.headers.get('Content-Length', 0))
+                    parametros = json.loads(self.rfile.read(longitud) or b'{}')
+                    resultado = getattr(cola_servida, metodo)(**parametros)
+                    self._responder(200, {'resultado': resultado})
+                except Exception as e:
+                    print(f"[ERROR] Error en {metodo}: {e}")
+                    self._responder(500, {'error': str(e)})
+
+            def _responder(self, codigo, cuerpo):
+                contenido = json.dumps(cuerpo, ensure_ascii=False).encode('utf-8')
+                self.send_response(codigo)
+                self.send_header('Content-Type', 'application/json; charset=utf-8')
+                self.send_header('Content-Length', str(len(contenido)))
+                self.end_headers()
+                self.wfile.write(contenido)
+
+            def log_message(self, formato, *args):
+                pass
+
+        self.servidor = HTTPServer((host, puerto), Manejador)
+
+    @property
+    def direccion(self):
+        host, puerto = self.servidor.server_address[:2]
+        return f"http://{host}:{puerto}"
+
+    def servir(self):
+        """Atiende peticiones hasta que se llame a detener()"""
+        print(f"[INFO] Cola disponible en {self.direccion}")
+        self.servidor.serve_forever()
+
+    def detener(self):
+        self.servidor.shutdown()
+        self.servidor.server_close()
+
+
+class ColaHTTP(ColaTrabajos):
+    """Cliente de una cola expuesta por ServidorCola en otro nodo"""
+
+    def __init__(self, url, timeout=30, token=None):
+        self.url = url.rstrip('/')
+        self.timeout = timeout
+        self.headers = {ServidorCola.ENCABEZADO_TOKEN: token} if token else {}
+
+    def _llamar(self, metodo, **parametros):
+        response = requests.post(f"{self.url}/{metodo}", json=parametros, headers=self.headers,
+                                 timeout=self.timeout)
+        try:
+            cuerpo = response.json()
+        except ValueError:
+            cuerpo = {'error': response.text}
+        if response.status_code != 200:
+            raise RuntimeError(f"Error de la cola en {metodo}: {cuerpo.get('error')}")
+        return cuerpo['resultado']
+
+    def encolar(self, placa, documento):
+        return self._llamar('encolar', placa=placa, documento=documento)
+
+    def reservar(self, trabajador, visibilidad):
+        return self._llamar('reservar', trabajador=trabajador, visibilidad=visibilidad)
+
+    def latido(self, trabajo_id, trabajador, visibilidad):
+        return self._llamar('latido', trabajo_id=trabajo_id, trabajador=trabajador, visibilidad=visibilidad)
+
+    def completar(self, trabajo_id, trabajador, datos):
+        return self._llamar('completar', trabajo_id=trabajo_id, trabajador=trabajador, datos=datos)
+
+    def fallar(self, trabajo_id, trabajador, error):
+        return self._llamar('fallar', trabajo_id=trabajo_id, trabajador=trabajador, error=error)
+
+    def liberar(self, trabajo_id, trabajador):
+        return self._llamar('liberar', trabajo_id=trabajo_id, trabajador=trabajador)
+
+    def resumen(self):
+        return self._llamar('resumen')
+
+    def resultados(self):
+        return self._llamar('resultados')
+
+
+class TrabajadorDistribuido:
+    """
+    Trabajador que toma consultas de una ColaTrabajos y escribe los resultados
+    en la misma cola. Mientras procesa un trabajo, un hilo envía latidos para
+    mantener el lease vigente.
+    """
+
+    def __init__(self, cola, anticaptcha_key=None, id_trabajador=None,
+                 visibilidad=300, intervalo_latido=60, procesar=None, carpeta_html=None,
+                 reintentos_cola=3, espera_reintento=1):
+        """
+        Args:
+            cola (ColaTrabajos): Cola compartida
+            anticaptcha_key (str): API Key de Anti-Captcha
+            id_trabajador (str): Identificador único (por defecto host-pid-uuid)
+            visibilidad (int): Segundos que dura un lease sin latidos
+            intervalo_latido (int): Segundos entre latidos
+            procesar (callable): Función (placa, documento) -> dict o None
+            carpeta_html (str): Carpeta donde guardar el HTML de cada consulta
+            reintentos_cola (int): Intentos de cada llamada a la cola al reportar un trabajo
+            espera_reintento (float): Segundos antes del primer reintento (se duplica en cada uno)
+        """
+        self.cola = cola
+        self.anticaptcha_key = anticaptcha_key
+        self.carpeta_html = carpeta_html
+        self._scraper = None
+        self.id_trabajador = id_trabajador or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self.visibilidad = visibilidad
+        self.intervalo_latido = intervalo_latido
+        self.procesar = procesar or self._consultar_con_selenium
+        self.reintentos_cola = reintentos_cola
+        self.espera_reintento = espera_reintento
+
+    def _consultar_con_selenium(self, placa, documento):
+        """
+        Procesa un trabajo con RuntScraperAngular, sin interacción del usuario.
+        El scraper se reutiliza entre trabajos para conservar las estrategias
+        de selectores aprendidas.
+        """
+        if self._scraper is None:
+            from scraper_runt import RuntScraperAngular
+            self._scraper = RuntScraperAngular(self.anticaptcha_key, carpeta_html=self.carpeta_html)
+
+        return self._scraper.consultar_vehiculo(
+            placa=placa,
+            numero_documento=documento,
+            interactivo=False,
+            guardar=False
+        )
+
+    def _llamar_cola(self, descripcion, funcion, *args):
+        """
+        Llama a la cola reintentando con espera exponencial. Un timeout de
+        ColaHTTP o un 'database is locked' no deben detener al trabajador ni
+        perder un resultado ya obtenido.
+
+        Returns:
+            Lo que retorne la cola, o None si todos los intentos fallaron
+        """
+        for intento in range(1, self.reintentos_cola + 1):
+            try:
+                return funcion(*args)
+            except Exception as e:
+                if intento == self.reintentos_cola:
+                    print(f"[ERROR] [{self.id_trabajador}] No se pudo {descripcion} "
+                          f"tras {intento} intento(s): {e}")
+                    return None
+                espera = self.espera_reintento * 2 ** (intento - 1)
+                print(f"[WARNING] [{self.id_trabajador}] Error al {descripcion}: {e}. Reintentando en {espera}s...")
+                time.sleep(espera)
+
+    def _enviar_latidos(self, trabajo_id, detener, lease_perdido):
+        """Renueva el lease periódicamente hasta que se detenga el hilo"""
+        while not detener.wait(self.intervalo_latido):
+            try:
+                if not self.cola.latido(trabajo_id, self.id_trabajador, self.visibilidad):
+                    print(f"[WARNING] [{self.id_trabajador}] Lease perdido para el trabajo {trabajo_id}")
+                    lease_perdido.set()
+                    return
+            except Exception as e:
+                print(f"[ERROR] [{self.id_trabajador}] Error al enviar latido: {e}")
+
+    def procesar_trabajo(self, trabajo):
+        """Procesa un trabajo reservado y reporta el resultado a la cola"""
+        print(f"[INFO] [{self.id_trabajador}] Trabajo {trabajo['id']}: "
+              f"{trabajo['placa']} / {trabajo['documento']} (intento {trabajo['intento']})")
+
+        detener = threading.Event()
+        lease_perdido = threading.Event()
+        hilo_latido = threading.Thread(
+            target=self._enviar_latidos,
+            args=(trabajo['id'], detener, lease_perdido),
+            daemon=True
+        )
+        hilo_latido.start()
+
+        interrumpido = False
+        try:
+            resultado = self.procesar(trabajo['placa'], trabajo['documento'])
+            error = None if resultado else "Consulta sin resultados"
+        except KeyboardInterrupt:
+            interrumpido = True
+        except Exception as e:
+            resultado = None
+            error = str(e)
+        finally:
+            detener.set()
+            hilo_latido.join()
+
+        if interrumpido:
+            # Se devuelve el trabajo sin gastar un intento y se detiene el trabajador
+            if self._llamar_cola("liberar el trabajo", self.cola.liberar, trabajo['id'], self.id_trabajador):
+                print(f"[WARNING] [{self.id_trabajador}] Trabajo {trabajo['id']} devuelto a la cola")
+            raise KeyboardInterrupt
+
+        if lease_perdido.is_set():
+            print(f"[WARNING] [{self.id_trabajador}] Se descarta el trabajo {trabajo['id']}, otro trabajador lo tomó")
+            return False
+
+        if resultado:
+            if self._llamar_cola("completar el trabajo", self.cola.completar,
+                                 trabajo['id'], self.id_trabajador, resultado):
+                print(f"[SUCCESS] [{self.id_trabajador}] Trabajo {trabajo['id']} completado")
+                return True
+            print(f"[WARNING] [{self.id_trabajador}] No se pudo completar el trabajo {trabajo['id']}")
+            return False
+
+        print(f"[ERROR] [{self.id_trabajador}] Trabajo {trabajo['id']} falló: {error}")
+        self._llamar_cola("reportar el fallo", self.cola.fallar, trabajo['id'], self.id_trabajador, error)
+        return False
+
+    def ejecutar(self, max_trabajos=None, esperar=False, intervalo_espera=10):
+        """
+        Procesa trabajos hasta vaciar la cola
+
+        Args:
+            max_trabajos (int): Límite de trabajos a procesar (None = sin límite)
+            esperar (bool): Si es True sigue consultando la cola cuando está vacía
+            intervalo_espera (int): Segundos entre consultas con la cola vacía
+        """
+        procesados = 0
+        print(f"[INFO] Trabajador {self.id_trabajador} iniciado")
+
+        try:
+            while max_trabajos is None or procesados < max_trabajos:
+                try:
+                    trabajo = self.cola.reservar(self.id_trabajador, self.visibilidad)
+                except Exception as e:
+                    print(f"[ERROR] [{self.id_trabajador}] Error al reservar trabajo: {e}")
+                    if not esperar:
+                        break
+                    time.sleep(intervalo_espera)
+                    continue
+
+                if trabajo is None:
+                    if not esperar:
+                        break
+                    time.sleep(intervalo_espera)
+                    continue
+
+                self.procesar_trabajo(trabajo)
+                procesados += 1
+        except KeyboardInterrupt:
+            print(f"\n[WARNING] Trabajador {self.id_trabajador} interrumpido por el usuario")
+
+        print(f"[INFO] Trabajador {self.id_trabajador} finalizado: {procesados} trabajo(s) procesado(s)")
+        return procesados
+
+
+def cargar_config(ruta_config):
+    """Lee el archivo config.json"""
+    with open(ruta_config, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def crear_cola(ruta_db, servidor=None, max_intentos=3, token=None):
+    """Cola remota si se indica un servidor, si no la cola SQLite local"""
+    if servidor:
+        return ColaHTTP(servidor, token=token)
+    return ColaSQLite(ruta_db, max_intentos=max_intentos)
+
+
+def _iniciar_trabajador(ruta_db, servidor, anticaptcha_key, visibilidad, intervalo_latido, max_intentos,
+                        esperar, carpeta_html=None, token=None):
+    """Punto de entrada de cada proceso trabajador"""
+    cola = crear_cola(ruta_db, servidor, max_intentos, token)
+    trabajador = TrabajadorDistribuido(
+        cola,
+        anticaptcha_key=anticaptcha_key,
+        visibilidad=visibilidad,
+        intervalo_latido=intervalo_latido,
+        carpeta_html=carpeta_html
+    )
+    trabajador.ejecutar(esperar=esperar)
+
+
+def main():
+    """Función principal del modo distribuido"""
+    directorio = os.path.dirname(os.path.abspath(__file__))
+
+    parser = argparse.ArgumentParser(description="Cola distribuida de consultas RUNT")
+    parser.add_argument('--db', default=os.path.join(directorio, 'cola_runt.db'),
+                        help="Archivo SQLite de la cola (solo procesos de esta máquina)")
+    parser.add_argument('--servidor', default=None,
+                        help="URL de un nodo con 'servir' (ej: http://10.0.0.5:8765); reemplaza a --db")
+    parser.add_argument('--config', default=os.path.join(directorio, 'config.json'),
+                        help="Archivo de configuración")
+    parser.add_argument('--max-intentos', type=int, default=3)
+    parser.add_argument('--token', default=None,
+                        help="Token compartido de la cola HTTP (por defecto 'token_cola' del config.json)")
+    subparsers = parser.add_subparsers(dest='comando', required=True)
+
+    subparsers.add_parser('encolar', help="Agrega a la cola las consultas del config.json")
+
+    parser_servir = subparsers.add_parser('servir', help="Expone la cola --db a otros nodos por HTTP")
+    parser_servir.add_argument('--host', default='127.0.0.1',
+                               help="Interfaz de escucha; para otros nodos use 0.0.0.0 con --token")
+    parser_servir.add_argument('--puerto', type=int, default=8765)
+
+    parser_trabajador = subparsers.add_parser('trabajador', help="Procesa trabajos de la cola")
+    parser_trabajador.add_argument('--procesos', type=int, default=1,
+                                   help="Cantidad de navegadores en paralelo en este nodo")
+    parser_trabajador.add_argument('--visibilidad', type=int, default=300,
+                                   help="Segundos de lease por trabajo")
+    parser_trabajador.add_argument('--latido', type=int, default=60,
+                                   help="Segundos entre latidos")
+    parser_trabajador.add_argument('--esperar', action='store_true',
+                                   help="Seguir esperando trabajos cuando la cola esté vacía")
+    parser_trabajador.add_argument('--carpeta-html', default=None,
+                                   help="Guardar el HTML de cada consulta en esta carpeta")
+
+    subparsers.add_parser('estado', help="Muestra la cantidad de trabajos por estado")
+
+    parser_exportar = subparsers.add_parser('exportar', help="Exporta los resultados a JSON")
+    parser_exportar.add_argument('--salida', default='resultados_runt.json')
+
+    args = parser.parse_args()
+
+    token = args.token
+    if token is None and os.path.exists(args.config):
+        token = cargar_config(args.config).get('token_cola')
+
+    if args.comando == 'servir':
+        if args.host not in HOSTS_LOCALES and not token:
+            print(f"[ERROR] Para exponer la cola en {args.host} configure un token (--token o 'token_cola')")
+            return
+        servidor = ServidorCola(ColaSQLite(args.db, max_intentos=args.max_intentos), args.host, args.puerto, token)
+        try:
+            servidor.servir()
+        except KeyboardInterrupt:
+            print("\n[INFO] Servidor de la cola detenido")
+        return
+
+    cola = crear_cola(args.db, args.servidor, args.max_intentos, token)
+
+    if args.comando == 'encolar':
+        config = cargar_config(args.config)
+        nuevos = sum(1 for c in config.get('consultas', []) if cola.encolar(c['placa'], c['documento']))
+        print(f"[SUCCESS] {nuevos} trabajo(s) nuevo(s) en la cola")
+
+    elif args.comando == 'trabajador':
+        config = cargar_config(args.config)
+        parametros = (args.db, args.servidor, config.get('anticaptcha_key'), args.visibilidad,
+                      args.latido, args.max_intentos, args.esperar, args.carpeta_html, token)
+        if args.procesos <= 1:
+            _iniciar_trabajador(*parametros)
+        else:
+            procesos = [multiprocessing.Process(target=_iniciar_trabajador, args=parametros)
+                        for _ in range(args.procesos)]
+            for proceso in procesos:
+                proceso.start()
+            try:
+                for proceso in procesos:
+                    proceso.join()
+            except KeyboardInterrupt:
+                # Cada proceso recibe también el Ctrl+C y devuelve su trabajo a la cola
+                print("\n[WARNING] Esperando a que los trabajadores liberen sus trabajos...")
+                for proceso in procesos:
+                    proceso.join()
+
+    elif args.comando == 'estado':
+        for estado, total in sorted(cola.resumen().items()):
+            print(f"  {estado.upper():12s}: {total}")
+
+    elif args.comando == 'exportar':
+        resultados = cola.resultados()
+        with open(args.salida, 'w', encoding='utf-8') as f:
+            json.dump(resultados, f, ensure_ascii=False, indent=2)
+        print(f"[SUCCESS] {len(resultados)} resultado(s) guardado(s) en: {args.salida}")
+
+
+if __name__ == "__main__":
+    main()
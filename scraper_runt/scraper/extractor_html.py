@@ -0,0 +1,260 @@
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from lxml import etree
+from lxml import html as lxml_html
+
+
+# Campo de vehicle_data -> etiqueta que lo precede en la página
+CAMPOS_PRINCIPALES = [
+    ('placa', 'PLACA DEL VEHÍCULO'),
+    ('tipo_servicio', 'TIPO DE SERVICIO'),
+    ('clase_vehiculo', 'CLASE DE VEHÍCULO'),
+    ('estado_vehiculo', 'ESTADO DEL VEHÍCULO'),
+    ('marca', 'MARCA'),
+    ('gravamenes', 'GRAVAMENES A LA PROPIEDAD'),
+]
+
+ETIQUETA_FIN_SOAT = 'Fecha fin de vigencia:'
+XPATH_CARD_SOAT = "//mat-card[.//mat-card-title[contains(text(), 'Póliza SOAT')]]"
+ETIQUETAS_IGNORADAS = ('script', 'style', 'noscript', 'template')
+
+# Elementos que el navegador muestra en su propia línea. Los componentes mat-*
+# de Angular Material son bloques salvo los de la lista EN_LINEA; las etiquetas
+# <label> de la consulta también se muestran en su propia línea.
+BLOQUES = {
+    'address', 'article', 'aside', 'blockquote', 'br', 'dd', 'div', 'dl', 'dt', 'fieldset',
+    'figure', 'footer', 'form', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'header', 'hr', 'label',
+    'li', 'main', 'nav', 'ol', 'p', 'pre', 'section', 'table', 'tbody', 'thead', 'tfoot',
+    'tr', 'ul',
+}
+EN_LINEA = {'mat-icon', 'mat-option-text', 'mat-checkbox', 'mat-radio-button'}
+CELDAS = {'td', 'th'}
+
+# guardar_html escribe en UTF-8; sin esto lxml asume latin-1 si la página no declara el charset
+PARSER_UTF8 = lxml_html.HTMLParser(encoding='utf-8')
+
+
+def _es_bloque(tag):
+    return tag in BLOQUES or (tag.startswith('mat-') and tag not in EN_LINEA)
+
+
+def _oculto(nodo):
+    """
+    Elementos que el navegador no muestra: atributo hidden o estilo en línea
+    que los oculta. aria-hidden no cuenta: solo afecta a los lectores de
+    pantalla y Selenium sí devuelve ese texto (p. ej. los mat-icon).
+    """
+    if nodo.get('hidden') is not None:
+        return True
+    estilo = nodo.get('style', '').replace(' ', '').lower()
+    return 'display:none' in estilo or 'visibility:hidden' in estilo
+
+
+def _panel_colapsado(nodo):
+    """Un mat-expansion-panel cerrado solo muestra su encabezado"""
+    if nodo.tag != 'mat-expansion-panel':
+        return None
+    for hijo in nodo:
+        if hijo.tag == 'mat-expansion-panel-header' and hijo.get('aria-expanded') == 'false':
+            return hijo
+    return None
+
+
+def _cortar_linea(partes):
+    linea = ' '.join(''.join(partes).split())
+    partes.clear()
+    if linea:
+        yield linea
+
+
+def _recorrer_lineas(nodo, partes):
+    bloque = _es_bloque(nodo.tag)
+    if bloque:
+        yield from _cortar_linea(partes)
+
+    if nodo.text:
+        partes.append(nodo.text)
+
+    encabezado = _panel_colapsado(nodo)
+    hijos = [encabezado] if encabezado is not None else nodo
+    for hijo in hijos:
+        if isinstance(hijo.tag, str) and not _oculto(hijo):
+            yield from _recorrer_lineas(hijo, partes)
+        if hijo.tail:
+            partes.append(hijo.tail)
+
+    if nodo.tag in CELDAS:
+        partes.append(' ')
+    if bloque:
+        yield from _cortar_linea(partes)
+
+
+def iterar_lineas(elemento):
+    """
+    Recorre las líneas de texto visibles del elemento en orden de documento.
+
+    Aproxima `element.text` de Selenium: los elementos de bloque cortan la
+    línea, el texto de los elementos en línea se une en la misma, se colapsan
+    los espacios y se omiten los elementos ocultos y el contenido de los
+    paneles colapsados. Sin el CSS de la página, qué es bloque se decide por
+    la etiqueta (ver BLOQUES). Los scripts y estilos se eliminan antes con
+    limpiar_documento.
+    """
+    partes = []
+    yield from _recorrer_lineas(elemento, partes)
+    yield from _cortar_linea(partes)
+
+
+def lineas_texto(elemento):
+    """Retorna la lista de líneas visibles del elemento"""
+    return list(iterar_lineas(elemento))
+
+
+def limpiar_documento(contenido_html):
+    """Parsea el HTML (str o bytes UTF-8) y elimina los nodos que no son texto visible"""
+    if isinstance(contenido_html, str):
+        # Como bytes para que lxml acepte una declaración <?xml encoding=...?>
+        contenido_html = contenido_html.encode('utf-8')
+    documento = lxml_html.document_fromstring(contenido_html, parser=PARSER_UTF8)
+    etree.strip_elements(documento, *ETIQUETAS_IGNORADAS, with_tail=False)
+    return documento
+
+
+def extraer_campos(lineas, campos=CAMPOS_PRINCIPALES, lineas_despues=3):
+    """
+    Busca todas las etiquetas en una sola pasada sobre las líneas.
+
+    Mismo criterio que buscar_valor de scraper_runt: la primera aparición de
+    la etiqueta que tenga un valor en las `lineas_despues` líneas siguientes.
+    Acepta un generador y deja de leerlo cuando encuentra todos los campos.
+    """
+    valores = {campo: None for campo, _ in campos}
+    # campo -> [etiqueta, líneas que quedan por revisar después de la etiqueta]
+    pendientes = {campo: [etiqueta.upper(), 0] for campo, etiqueta in campos}
+
+    for linea in lineas:
+        linea_upper = linea.upper()
+        for campo, pendiente in list(pendientes.items()):
+            etiqueta, restantes = pendiente
+            if restantes:
+                if linea_upper != etiqueta:
+                    valores[campo] = linea
+                    del pendientes[campo]
+                    continue
+                pendiente[1] -= 1
+            if etiqueta in linea_upper:
+                pendiente[1] = lineas_despues
+        if not pendientes:
+            break
+
+    return valores
+
+
+def extraer_fecha_soat(lineas_soat, etiqueta=ETIQUETA_FIN_SOAT):
+    """Extrae la fecha fin de vigencia, esté en la misma línea que la etiqueta o en la siguiente"""
+    for i, linea in enumerate(lineas_soat):
+        if etiqueta in linea:
+            valor = linea.split(etiqueta, 1)[1].replace(':', '').strip()
+            if not valor and i + 1 < len(lineas_soat):
+                valor = lineas_soat[i + 1].replace(':', '').strip()
+            return valor or None
+    return None
+
+
+def extraer_datos_html(contenido_html, fecha_consulta=None):
+    """
+    Extrae los mismos campos de vehicle_data que extraer_resultados a partir
+    del HTML guardado de una consulta.
+    """
+    documento = limpiar_documento(contenido_html)
+    body = documento.find('body')
+    if body is None:
+        body = documento
+
+    vehicle_data = extraer_campos(iterar_lineas(body))
+
+    vehicle_data['soat_fecha_fin_vigencia'] = None
+    cards_soat = documento.xpath(XPATH_CARD_SOAT)
+    if cards_soat:
+        vehicle_data['soat_fecha_fin_vigencia'] = extraer_fecha_soat(lineas_texto(cards_soat[0]))
+
+    vehicle_data['fecha_consulta'] = fecha_consulta
+    return vehicle_data
+
+
+def extraer_archivo(ruta):
+    """Extrae los datos de un archivo HTML. La fecha de consulta es la del archivo"""
+    with open(ruta, 'rb') as f:
+        contenido = f.read()
+    fecha = datetime.fromtimestamp(os.path.getmtime(ruta)).strftime("%Y-%m-%d %H:%M:%S")
+    return extraer_datos_html(contenido, fecha_consulta=fecha)
+
+
+def _extraer_archivo_seguro(ruta):
+    """Versión para el pool de procesos: un archivo dañado no detiene el lote"""
+    try:
+        return ruta, extraer_archivo(ruta), None
+    except Exception as e:
+        return ruta, None, str(e)
+
+
+def listar_html(carpeta):
+    """Lista los archivos .html de una carpeta"""
+    return sorted(
+        os.path.join(carpeta, nombre)
+        for nombre in os.listdir(carpeta)
+        if nombre.lower().endswith('.html')
+    )
+
+
+def procesar_lote(rutas, procesos=None, chunksize=32):
+    """
+    Extrae los datos de muchos archivos HTML en paralelo
+
+    Args:
+        rutas (list): Rutas de los archivos HTML
+        procesos (int): Procesos del pool (None = núcleos disponibles, 1 = sin pool)
+        chunksize (int): Archivos enviados a cada proceso por tarea
+
+    Returns:
+        list: Tuplas (ruta, vehicle_data o None, error o None)
+    """
+    if procesos == 1:
+        return [_extraer_archivo_seguro(ruta) for ruta in rutas]
+
+    with ProcessPoolExecutor(max_workers=procesos) as executor:
+        return list(executor.map(_extraer_archivo_seguro, rutas, chunksize=chunksize))
+
+
+def main():
+    """Extrae los datos de una carpeta de HTML guardados"""
+    parser = argparse.ArgumentParser(description="Extracción de datos RUNT desde HTML guardado")
+    parser.add_argument('carpeta', help="Carpeta con los archivos .html")
+    parser.add_argument('--salida', default='resultados_html.json')
+    parser.add_argument('--procesos', type=int, default=None)
+    args = parser.parse_args()
+
+    rutas = listar_html(args.carpeta)
+    print(f"[INFO] Procesando {len(rutas)} archivo(s) HTML...")
+
+    resultados = []
+    for ruta, datos, error in procesar_lote(rutas, procesos=args.procesos):
+        if error:
+            print(f"  [ERROR] {ruta}: {error}")
+            continue
+        datos_limpios = {k: v for k, v in datos.items() if v is not None and v != ''}
+        datos_limpios['archivo_html'] = os.path.basename(ruta)
+        resultados.append(datos_limpios)
+
+    with open(args.salida, 'w', encoding='utf-8') as f:
+        json.dump(resultados, f, ensure_ascii=False, indent=2)
+
+    print(f"[SUCCESS] {len(resultados)} resultado(s) guardado(s) en: {args.salida}")
+
+
+if __name__ == "__main__":
+    main()
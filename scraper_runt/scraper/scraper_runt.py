@@ -1,10 +1,11 @@
 from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.keys import Keys
+from selenium.common.exceptions import TimeoutException
+from selectores import RegistroSelectores
 import requests
 import time
 import base64
@@ -13,6 +14,75 @@ import os
 from datetime import datetime
 
 
+# Estrategias de búsqueda por elemento, en orden de preferencia.
+# RegistroSelectores prueba primero la última que funcionó.
+SELECTORES = {
+    'select_procedencia': [(By.XPATH, "//mat-select[@formcontrolname='procedencia']")],
+    'opcion_nacional': [
+        (By.XPATH, "//mat-option//span[contains(text(), 'NACIONAL')]"),
+        (By.XPATH, "//mat-option[contains(., 'NACIONAL')]"),
+    ],
+    'select_tipo_consulta': [(By.XPATH, "//mat-select[@formcontrolname='tipoConsulta']")],
+    'opcion_placa_propietario': [
+        (By.XPATH, "//mat-option//span[contains(text(), 'Placa y Propietario')]"),
+        (By.XPATH, "//mat-option[contains(., 'Placa y Propietario')]"),
+    ],
+    'input_placa': [(By.XPATH, "//input[@formcontrolname='placa']")],
+    'select_tipo_documento': [(By.XPATH, "//mat-select[@formcontrolname='tipoDocumento']")],
+    'opcion_cedula': [
+        (By.XPATH, "//mat-option//span[contains(text(), 'Cédula Ciudadanía')]"),
+        (By.XPATH, "//mat-option[contains(., 'Cédula Ciudadanía')]"),
+    ],
+    'input_documento': [(By.XPATH, "//input[@formcontrolname='documento']")],
+    'imagen_captcha': [
+        (By.XPATH, "//input[@formcontrolname='captcha']/preceding::img[1]"),
+        (By.XPATH, "//div[contains(@class, 'ng-star-inserted')]//img"),
+    ],
+    'input_captcha': [(By.XPATH, "//input[@formcontrolname='captcha']")],
+    'boton_consultar': [
+        (By.XPATH, "//button[contains(text(), 'Consultar')]"),
+        (By.XPATH, "//button[contains(., 'Consultar')]"),
+        (By.XPATH, "//form[.//input[@formcontrolname='captcha']]//button[@type='submit']"),
+    ],
+    'panel_soat': [
+        # Por el texto "Póliza SOAT"
+        (By.XPATH, "//mat-expansion-panel-header[contains(., 'Póliza SOAT')]"),
+        # Por el icono credit_card
+        (By.XPATH, "//mat-icon[text()='credit_card']/ancestor::mat-expansion-panel-header"),
+        # Por el título del panel
+        (By.XPATH, "//mat-expansion-panel-header[.//mat-panel-title[contains(text(), 'SOAT')]]"),
+    ],
+    'card_soat': [(By.XPATH, "//mat-card[.//mat-card-title[contains(text(), 'Póliza SOAT')]]")],
+}
+
+
+def buscar_valor(lineas, etiqueta, lineas_despues=3):
+    """Busca el valor que aparece en las líneas siguientes a una etiqueta"""
+    for i, linea in enumerate(lineas):
+        if etiqueta.upper() in linea.upper():
+            # Buscar en las siguientes líneas
+            for j in range(1, lineas_despues + 1):
+                if i + j < len(lineas):
+                    valor = lineas[i + j].strip()
+                    if valor and valor.upper() != etiqueta.upper() and len(valor) > 0:
+                        return valor
+    return None
+
+
+def extraer_valor_soat(lineas_soat, etiqueta):
+    """Extrae el valor que aparece después de una etiqueta en la misma línea"""
+    for linea in lineas_soat:
+        if etiqueta in linea:
+            # Dividir por el label y tomar la parte después
+            partes = linea.split(etiqueta)
+            if len(partes) > 1:
+                valor = partes[1].strip()
+                # Limpiar caracteres especiales
+                valor = valor.replace(':', '').strip()
+                return valor if valor else None
+    return None
+
+
 class AntiCaptchaClient:
     
     def __init__(self, api_key):
@@ -104,11 +174,17 @@ class AntiCaptchaClient:
 
 class RuntScraperAngular:
     
-    def __init__(self, anticaptcha_key):
+    def __init__(self, anticaptcha_key, carpeta_html=None):
+        """
+        Args:
+            anticaptcha_key (str): API Key de Anti-Captcha
+            carpeta_html (str): Carpeta donde guardar el HTML de cada consulta (None = no guardar)
+        """
         self.anticaptcha_client = AntiCaptchaClient(anticaptcha_key)
         self.driver = None
-        self.wait = None
         self.base_url = "https://www.runt.gov.co/consultaCiudadana/#/consultaVehiculo"
+        self.carpeta_html = carpeta_html
+        self.selectores = RegistroSelectores(SELECTORES, timeout=20)
         
     def iniciar_navegador(self):
         """Inicia el navegador Chrome"""
@@ -122,7 +198,6 @@ class RuntScraperAngular:
             chrome_options.add_experimental_option('useAutomationExtension', False)
             
             self.driver = webdriver.Chrome(options=chrome_options)
-            self.wait = WebDriverWait(self.driver, 20)
             
             print("[SUCCESS] Navegador iniciado correctamente")
             return True
@@ -154,16 +229,12 @@ class RuntScraperAngular:
             print("[INFO] Seleccionando Procedencia: NACIONAL...")
             
             # Buscar el mat-select de procedencia
-            select_procedencia = self.wait.until(
-                EC.element_to_be_clickable((By.XPATH, "//mat-select[@formcontrolname='procedencia']"))
-            )
+            select_procedencia = self.selectores.buscar(self.driver, 'select_procedencia', EC.element_to_be_clickable)
             select_procedencia.click()
             time.sleep(1)
             
             # Seleccionar opción NACIONAL
-            opcion_nacional = self.wait.until(
-                EC.element_to_be_clickable((By.XPATH, "//mat-option//span[contains(text(), 'NACIONAL')]"))
-            )
+            opcion_nacional = self.selectores.buscar(self.driver, 'opcion_nacional', EC.element_to_be_clickable)
             opcion_nacional.click()
             
             print("  [SUCCESS] NACIONAL seleccionado")
@@ -180,16 +251,12 @@ class RuntScraperAngular:
             print("[INFO] Seleccionando Consulta por: Placa y Propietario...")
             
             # Buscar el mat-select de tipo de consulta
-            select_consulta = self.wait.until(
-                EC.element_to_be_clickable((By.XPATH, "//mat-select[@formcontrolname='tipoConsulta']"))
-            )
+            select_consulta = self.selectores.buscar(self.driver, 'select_tipo_consulta', EC.element_to_be_clickable)
             select_consulta.click()
             time.sleep(1)
             
             # Seleccionar opción "Placa y Propietario"
-            opcion_placa = self.wait.until(
-                EC.element_to_be_clickable((By.XPATH, "//mat-option//span[contains(text(), 'Placa y Propietario')]"))
-            )
+            opcion_placa = self.selectores.buscar(self.driver, 'opcion_placa_propietario', EC.element_to_be_clickable)
             opcion_placa.click()
             
             print("  [SUCCESS] Placa y Propietario seleccionado")
@@ -206,9 +273,7 @@ class RuntScraperAngular:
             print(f"[INFO] Ingresando placa: {placa}")
             
             # Buscar el input de placa
-            input_placa = self.wait.until(
-                EC.presence_of_element_located((By.XPATH, "//input[@formcontrolname='placa']"))
-            )
+            input_placa = self.selectores.buscar(self.driver, 'input_placa')
             input_placa.clear()
             input_placa.send_keys(placa.upper())
             
@@ -226,16 +291,12 @@ class RuntScraperAngular:
             print("[INFO] Seleccionando Tipo de Documento: Cédula Ciudadanía...")
             
             # Buscar el mat-select de tipo de documento
-            select_documento = self.wait.until(
-                EC.element_to_be_clickable((By.XPATH, "//mat-select[@formcontrolname='tipoDocumento']"))
-            )
+            select_documento = self.selectores.buscar(self.driver, 'select_tipo_documento', EC.element_to_be_clickable)
             select_documento.click()
             time.sleep(1)
             
             # Seleccionar opción "Cédula Ciudadanía"
-            opcion_cc = self.wait.until(
-                EC.element_to_be_clickable((By.XPATH, "//mat-option//span[contains(text(), 'Cédula Ciudadanía')]"))
-            )
+            opcion_cc = self.selectores.buscar(self.driver, 'opcion_cedula', EC.element_to_be_clickable)
             opcion_cc.click()
             
             print("  [SUCCESS] Cédula Ciudadanía seleccionada")
@@ -252,9 +313,7 @@ class RuntScraperAngular:
             print(f"[INFO] Ingresando número de documento: {numero_documento}")
             
             # Buscar el input de documento
-            input_documento = self.wait.until(
-                EC.presence_of_element_located((By.XPATH, "//input[@formcontrolname='documento']"))
-            )
+            input_documento = self.selectores.buscar(self.driver, 'input_documento')
             input_documento.clear()
             input_documento.send_keys(numero_documento)
             
@@ -272,9 +331,7 @@ class RuntScraperAngular:
             print("[INFO] Capturando CAPTCHA...")
             
             # Buscar la imagen del CAPTCHA
-            captcha_img = self.wait.until(
-                EC.presence_of_element_located((By.XPATH, "//div[contains(@class, 'ng-star-inserted')]//img"))
-            )
+            captcha_img = self.selectores.buscar(self.driver, 'imagen_captcha')
             
             # Capturar screenshot del CAPTCHA
             captcha_png = captcha_img.screenshot_as_png
@@ -293,9 +350,7 @@ class RuntScraperAngular:
             print(f"[INFO] Ingresando CAPTCHA: {captcha_text}")
             
             # Buscar el input del CAPTCHA
-            input_captcha = self.wait.until(
-                EC.presence_of_element_located((By.XPATH, "//input[@formcontrolname='captcha']"))
-            )
+            input_captcha = self.selectores.buscar(self.driver, 'input_captcha')
             input_captcha.clear()
             input_captcha.send_keys(captcha_text)
             
@@ -313,9 +368,7 @@ class RuntScraperAngular:
             print("[INFO] Enviando formulario...")
             
             # Buscar y hacer clic en el botón de consultar
-            boton_consultar = self.wait.until(
-                EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'Consultar') or @type='submit']"))
-            )
+            boton_consultar = self.selectores.buscar(self.driver, 'boton_consultar', EC.element_to_be_clickable)
             boton_consultar.click()
             
             print("  [SUCCESS] Formulario enviado")
@@ -334,7 +387,7 @@ class RuntScraperAngular:
             if error_elements:
                 return True
             return False
-        except:
+        except Exception:
             return False
     
     def extraer_resultados(self):
@@ -365,73 +418,24 @@ class RuntScraperAngular:
             # Dividir en líneas para procesar
             lineas = body_text.split('\n')
             
-            # Función para buscar el valor después de un label
-            def buscar_valor(etiqueta, lineas_despues=3):
-                for i, linea in enumerate(lineas):
-                    if etiqueta.upper() in linea.upper():
-                        # Buscar en las siguientes líneas
-                        for j in range(1, lineas_despues + 1):
-                            if i + j < len(lineas):
-                                valor = lineas[i + j].strip()
-                                if valor and valor.upper() != etiqueta.upper() and len(valor) > 0:
-                                    return valor
-                return None
-            
             # Extraer SOLO los campos principales
             print("  [INFO] Extrayendo campos principales...")
             
-            vehicle_data['placa'] = buscar_valor('PLACA DEL VEHÍCULO')
-            vehicle_data['tipo_servicio'] = buscar_valor('TIPO DE SERVICIO')
-            vehicle_data['estado_vehiculo'] = buscar_valor('ESTADO DEL VEHÍCULO')
-            vehicle_data['clase_vehiculo'] = buscar_valor('CLASE DE VEHÍCULO')
-            vehicle_data['marca'] = buscar_valor('MARCA')
-            vehicle_data['gravamenes'] = buscar_valor('GRAVAMENES A LA PROPIEDAD')
+            vehicle_data['placa'] = buscar_valor(lineas, 'PLACA DEL VEHÍCULO')
+            vehicle_data['tipo_servicio'] = buscar_valor(lineas, 'TIPO DE SERVICIO')
+            vehicle_data['estado_vehiculo'] = buscar_valor(lineas, 'ESTADO DEL VEHÍCULO')
+            vehicle_data['clase_vehiculo'] = buscar_valor(lineas, 'CLASE DE VEHÍCULO')
+            vehicle_data['marca'] = buscar_valor(lineas, 'MARCA')
+            vehicle_data['gravamenes'] = buscar_valor(lineas, 'GRAVAMENES A LA PROPIEDAD')
             
             # Extraer datos completos del SOAT
             print("  [INFO] Buscando panel de Póliza SOAT...")
             try:
-                # Buscar el panel de Póliza SOAT de diferentes formas
-                time.sleep(2)
-                
-                # Intentar varios selectores
-                panel_encontrado = False
-                
-                # Intento 1: Por el texto "Póliza SOAT"
+                # Buscar el panel de Póliza SOAT (prueba primero la estrategia que funcionó antes)
                 try:
-                    panel_soat = self.driver.find_element(
-                        By.XPATH, 
-                        "//mat-expansion-panel-header[contains(., 'Póliza SOAT')]"
-                    )
-                    panel_encontrado = True
-                    print("  [SUCCESS] Panel encontrado (método 1)")
-                except:
-                    pass
-                
-                # Intento 2: Por el icono credit_card
-                if not panel_encontrado:
-                    try:
-                        panel_soat = self.driver.find_element(
-                            By.XPATH, 
-                            "//mat-icon[text()='credit_card']/ancestor::mat-expansion-panel-header"
-                        )
-                        panel_encontrado = True
-                        print("  [SUCCESS] Panel encontrado (método 2)")
-                    except:
-                        pass
-                
-                # Intento 3: Por la clase
-                if not panel_encontrado:
-                    try:
-                        panel_soat = self.driver.find_element(
-                            By.XPATH,
-                            "//mat-expansion-panel-header[.//mat-panel-title[contains(text(), 'SOAT')]]"
-                        )
-                        panel_encontrado = True
-                        print("  [SUCCESS] Panel encontrado (método 3)")
-                    except:
-                        pass
-                
-                if not panel_encontrado:
+                    panel_soat = self.selectores.buscar(self.driver, 'panel_soat', timeout=3)
+                    print("  [SUCCESS] Panel de Póliza SOAT encontrado")
+                except TimeoutException:
                     print("  [ERROR] No se pudo encontrar el panel de Póliza SOAT")
                     raise Exception("Panel no encontrado")
                 
@@ -462,10 +466,7 @@ class RuntScraperAngular:
                 
                 try:
                     # Buscar el mat-card de Póliza SOAT
-                    soat_card = self.driver.find_element(
-                        By.XPATH,
-                        "//mat-card[.//mat-card-title[contains(text(), 'Póliza SOAT')]]"
-                    )
+                    soat_card = self.selectores.buscar(self.driver, 'card_soat', timeout=5)
                     
                     print("  [SUCCESS] mat-card de SOAT encontrado")
                     
@@ -473,21 +474,8 @@ class RuntScraperAngular:
                     card_text = soat_card.text
                     lineas_soat = card_text.split('\n')
                     
-                    # Función para extraer valor después de un label
-                    def extraer_valor_soat(etiqueta):
-                        for linea in lineas_soat:
-                            if etiqueta in linea:
-                                # Dividir por el label y tomar la parte después
-                                partes = linea.split(etiqueta)
-                                if len(partes) > 1:
-                                    valor = partes[1].strip()
-                                    # Limpiar caracteres especiales
-                                    valor = valor.replace(':', '').strip()
-                                    return valor if valor else None
-                        return None
-                    
                     # Extraer SOLO la fecha de fin de vigencia
-                    fecha_fin = extraer_valor_soat('Fecha fin de vigencia:')
+                    fecha_fin = extraer_valor_soat(lineas_soat, 'Fecha fin de vigencia:')
                     
                     # Guardar en vehicle_data
                     vehicle_data['soat_fecha_fin_vigencia'] = fecha_fin
@@ -519,7 +507,7 @@ class RuntScraperAngular:
             traceback.print_exc()
             return None
     
-    def consultar_vehiculo(self, placa, numero_documento, max_intentos=3):
+    def consultar_vehiculo(self, placa, numero_documento, max_intentos=3, interactivo=True, guardar=True):
         """
         Realiza la consulta completa del vehículo
         
@@ -527,6 +515,8 @@ class RuntScraperAngular:
             placa (str): Número de placa (ej: "OUG59H")
             numero_documento (str): Número de documento (ej: "1043641484")
             max_intentos (int): Número máximo de intentos
+            interactivo (bool): Si es False no se espera Enter del usuario al terminar
+            guardar (bool): Si es False no se escribe en resultados_runt.json
         """
         print("\n" + "="*70)
         print("SCRAPER RUNT - Consulta Vehicular Automatizada (Versión Simplificada)")
@@ -601,6 +591,10 @@ class RuntScraperAngular:
                 # 12. Extraer resultados
                 resultados = self.extraer_resultados()
                 
+                # Guardar el HTML de la consulta para procesarlo sin navegador
+                if self.carpeta_html:
+                    self.guardar_html(placa)
+                
                 if resultados:
                     # Limpiar datos antes de mostrar
                     resultados_limpios = {k: v for k, v in resultados.items() if v is not None and v != '' and v != 'None'}
@@ -614,12 +608,14 @@ class RuntScraperAngular:
                         self.mostrar_resultados(resultados_limpios)
                         
                         # Guardar en archivo JSON
-                        self.guardar_resultado(resultados)
+                        if guardar:
+                            self.guardar_resultado(resultados)
                         
                         # Pausa para ver resultados
-                        print("\n[INFO] El navegador permanecerá abierto para que veas los resultados...")
-                        print("[INFO] Presiona Enter cuando termines de revisar...")
-                        input()
+                        if interactivo:
+                            print("\n[INFO] El navegador permanecerá abierto para que veas los resultados...")
+                            print("[INFO] Presiona Enter cuando termines de revisar...")
+                            input()
                         
                         return resultados
                     else:
@@ -632,14 +628,19 @@ class RuntScraperAngular:
                     continue
             
             print("\n[ERROR] No se pudo completar la consulta después de todos los intentos")
-            print("\n[INFO] Presiona Enter para cerrar el navegador...")
-            input()
+            if interactivo:
+                print("\n[INFO] Presiona Enter para cerrar el navegador...")
+                input()
             return None
             
         except KeyboardInterrupt:
             print("\n\n[WARNING] Proceso interrumpido por el usuario")
+            # Sin usuario (modo distribuido) quien llama debe saber que fue una interrupción
+            if not interactivo:
+                raise
             return None
         finally:
+            self.selectores.mostrar_estadisticas()
             self.cerrar_navegador()
     
     def mostrar_resultados(self, vehicle_data):
@@ -683,6 +684,23 @@ class RuntScraperAngular:
         except Exception as e:
             print(f"[ERROR] Error al guardar: {e}")
     
+    def guardar_html(self, placa):
+        """Guarda driver.page_source para extraer los datos sin navegador"""
+        try:
+            os.makedirs(self.carpeta_html, exist_ok=True)
+            nombre = f"{placa.upper()}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.html"
+            ruta = os.path.join(self.carpeta_html, nombre)
+            
+            with open(ruta, 'w', encoding='utf-8') as f:
+                f.write(self.driver.page_source)
+            
+            print(f"[SUCCESS] HTML guardado en: {ruta}")
+            return ruta
+            
+        except Exception as e:
+            print(f"[ERROR] Error al guardar HTML: {e}")
+            return None
+    
     def cerrar_navegador(self):
         """Cierra el navegador"""
         if self.driver:
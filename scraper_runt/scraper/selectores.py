@@ -0,0 +1,145 @@
+import time
+
+from selenium.common.exceptions import (
+    NoSuchElementException,
+    StaleElementReferenceException,
+    TimeoutException,
+)
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+
+class RegistroSelectores:
+    """
+    Registro de estrategias de búsqueda por elemento.
+
+    Cada elemento tiene varias estrategias (locators). En cada sondeo se
+    prueban todas, empezando por la última que funcionó, con una búsqueda
+    inmediata por estrategia. Así un cambio en el HTML solo cuesta pasar a la
+    siguiente estrategia, en lugar de esperar un timeout completo por cada
+    una. Si la ganadora no es la preferida, cada `revalidar_cada` búsquedas
+    se usa el orden de preferencia para que una estrategia mejor pueda
+    volver a ganar.
+    """
+
+    def __init__(self, selectores, timeout=20, intervalo=0.25, revalidar_cada=5):
+        """
+        Args:
+            selectores (dict): nombre -> lista de locators (By, valor) en orden de preferencia
+            timeout (int): Segundos máximos de espera por búsqueda
+            intervalo (float): Segundos entre sondeos
+            revalidar_cada (int): Búsquedas entre intentos del orden de preferencia
+        """
+        self.selectores = {nombre: list(estrategias) for nombre, estrategias in selectores.items()}
+        self.timeout = timeout
+        self.intervalo = intervalo
+        self.revalidar_cada = revalidar_cada
+        self.ganadores = {}
+        self.estadisticas = {nombre: self._estadisticas_vacias() for nombre in self.selectores}
+
+    def _estadisticas_vacias(self):
+        return {
+            'busquedas': 0,
+            'exitos': 0,
+            'fallos': 0,
+            'tiempo_total': 0.0,
+            'tiempo_max': 0.0,
+            'aciertos': {}
+        }
+
+    def _orden(self, nombre):
+        """Estrategias del elemento con la última ganadora al inicio"""
+        estrategias = self.selectores[nombre]
+        ganador = self.ganadores.get(nombre)
+        if ganador is None or ganador == estrategias[0]:
+            return estrategias
+        if self.estadisticas[nombre]['busquedas'] % self.revalidar_cada == 0:
+            return estrategias
+        return [ganador] + [estrategia for estrategia in estrategias if estrategia != ganador]
+
+    def _registrar(self, nombre, estrategia, duracion):
+        estadisticas = self.estadisticas[nombre]
+        estadisticas['busquedas'] += 1
+        estadisticas['tiempo_total'] += duracion
+        estadisticas['tiempo_max'] = max(estadisticas['tiempo_max'], duracion)
+        if estrategia is None:
+            estadisticas['fallos'] += 1
+            return
+        estadisticas['exitos'] += 1
+        clave = estrategia[1]
+        estadisticas['aciertos'][clave] = estadisticas['aciertos'].get(clave, 0) + 1
+        if self.ganadores.get(nombre) != estrategia:
+            if nombre in self.ganadores:
+                print(f"  [WARNING] Selector '{nombre}' cambió de estrategia: {clave}")
+            self.ganadores[nombre] = estrategia
+
+    def buscar(self, driver, nombre, condicion=EC.presence_of_element_located, timeout=None):
+        """
+        Busca un elemento registrado
+
+        Args:
+            driver: WebDriver de Selenium
+            nombre (str): Nombre del elemento en el registro
+            condicion: Expected condition que recibe un locator (por defecto presencia)
+            timeout (float): Segundos máximos de espera (por defecto el del registro)
+
+        Returns:
+            WebElement encontrado
+
+        Raises:
+            TimeoutException: Si ninguna estrategia encontró el elemento
+        """
+        estrategias = self._orden(nombre)
+        encontrada = {}
+
+        def probar_estrategias(driver):
+            for estrategia in estrategias:
+                try:
+                    elemento = condicion(estrategia)(driver)
+                except (NoSuchElementException, StaleElementReferenceException):
+                    continue
+                if elemento:
+                    encontrada['estrategia'] = estrategia
+                    return elemento
+            return False
+
+        inicio = time.perf_counter()
+        try:
+            elemento = WebDriverWait(
+                driver,
+                self.timeout if timeout is None else timeout,
+                poll_frequency=self.intervalo
+            ).until(probar_estrategias)
+        except TimeoutException:
+            self._registrar(nombre, None, time.perf_counter() - inicio)
+            raise TimeoutException(f"Ninguna estrategia encontró '{nombre}'")
+
+        self._registrar(nombre, encontrada['estrategia'], time.perf_counter() - inicio)
+        return elemento
+
+    def resumen(self):
+        """Retorna las estadísticas por selector con la estrategia ganadora y la latencia promedio"""
+        resumen = {}
+        for nombre, estadisticas in self.estadisticas.items():
+            ganador = self.ganadores.get(nombre)
+            resumen[nombre] = dict(
+                estadisticas,
+                aciertos=dict(estadisticas['aciertos']),
+                ganador=ganador[1] if ganador else None,
+                tiempo_promedio=(estadisticas['tiempo_total'] / estadisticas['busquedas']
+                                 if estadisticas['busquedas'] else 0.0)
+            )
+        return resumen
+
+    def mostrar_estadisticas(self):
+        """Muestra en consola las estadísticas de los selectores usados"""
+        print("\nESTADÍSTICAS DE SELECTORES:")
+        print("-" * 70)
+        for nombre, estadisticas in self.resumen().items():
+            if not estadisticas['busquedas']:
+                continue
+            print(f"  {nombre:22s}: {estadisticas['exitos']}/{estadisticas['busquedas']} éxitos, "
+                  f"promedio {estadisticas['tiempo_promedio']:.2f}s, máx {estadisticas['tiempo_max']:.2f}s")
+            for estrategia, aciertos in estadisticas['aciertos'].items():
+                print(f"    {aciertos:4d} x {estrategia}")
+        print("-" * 70)
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Los módulos del scraper se importan como scripts hermanos (sin paquete)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scraper'))
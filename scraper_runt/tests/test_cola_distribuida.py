@@ -0,0 +1,239 @@
+import multiprocessing
+import os
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from cola_distribuida import ColaHTTP, ColaSQLite, ColaTrabajos, ServidorCola, TrabajadorDistribuido
+
+
+@pytest.fixture
+def ruta_db(tmp_path):
+    return str(tmp_path / 'cola.db')
+
+
+def _registrar_consulta(ruta_log, placa):
+    """procesar de prueba: deja constancia de cada consulta ejecutada"""
+    with open(ruta_log, 'a', encoding='utf-8') as f:
+        f.write(f"{placa}\n")
+    return {'placa': placa, 'pid': os.getpid()}
+
+
+def _trabajador_en_proceso(ruta_db, ruta_log):
+    cola = ColaSQLite(ruta_db)
+    TrabajadorDistribuido(
+        cola,
+        procesar=lambda placa, documento: _registrar_consulta(ruta_log, placa),
+        visibilidad=30,
+        intervalo_latido=5
+    ).ejecutar()
+
+
+def test_interfaz_es_abstracta():
+    with pytest.raises(TypeError):
+        ColaTrabajos()
+
+
+def test_encolar_ignora_duplicados(ruta_db):
+    cola = ColaSQLite(ruta_db)
+    assert cola.encolar('abc123', '1')
+    assert not cola.encolar('ABC123', '1')
+    assert cola.resumen() == {'pendiente': 1}
+
+
+def test_reservar_y_completar(ruta_db):
+    cola = ColaSQLite(ruta_db)
+    cola.encolar('ABC123', '1')
+
+    trabajo = cola.reservar('t1', 30)
+    assert trabajo['placa'] == 'ABC123'
+    assert trabajo['intento'] == 1
+    assert cola.reservar('t2', 30) is None
+
+    assert cola.completar(trabajo['id'], 't1', {'placa': 'ABC123'})
+    assert cola.resumen() == {'completado': 1}
+    assert cola.resultados() == [{'placa': 'ABC123'}]
+
+
+def test_lease_vencido_se_reencola(ruta_db):
+    cola = ColaSQLite(ruta_db)
+    cola.encolar('ABC123', '1')
+
+    trabajo = cola.reservar('caido', 0.1)
+    time.sleep(0.2)
+    nuevo = cola.reservar('vivo', 30)
+
+    assert nuevo['id'] == trabajo['id']
+    assert nuevo['intento'] == 2
+
+
+def test_latido_mantiene_el_lease(ruta_db):
+    cola = ColaSQLite(ruta_db)
+    cola.encolar('ABC123', '1')
+
+    trabajo = cola.reservar('t1', 0.3)
+    time.sleep(0.2)
+    assert cola.latido(trabajo['id'], 't1', 30)
+    time.sleep(0.2)
+    assert cola.reservar('t2', 30) is None
+
+
+def test_completar_de_trabajador_viejo_es_rechazado(ruta_db):
+    cola = ColaSQLite(ruta_db)
+    cola.encolar('ABC123', '1')
+
+    trabajo = cola.reservar('viejo', 0.1)
+    time.sleep(0.2)
+    cola.reservar('nuevo', 30)
+
+    assert not cola.latido(trabajo['id'], 'viejo', 30)
+    assert not cola.completar(trabajo['id'], 'viejo', {'placa': 'ABC123'})
+    assert cola.completar(trabajo['id'], 'nuevo', {'placa': 'ABC123'})
+
+
+def test_max_intentos_marca_fallido(ruta_db):
+    cola = ColaSQLite(ruta_db, max_intentos=2)
+    cola.encolar('ABC123', '1')
+
+    trabajo = cola.reservar('t1', 30)
+    cola.fallar(trabajo['id'], 't1', 'error 1')
+    assert cola.resumen() == {'pendiente': 1}
+
+    trabajo = cola.reservar('t1', 30)
+    cola.fallar(trabajo['id'], 't1', 'error 2')
+    assert cola.resumen() == {'fallido': 1}
+    assert cola.reservar('t1', 30) is None
+
+
+def test_lease_vencido_en_ultimo_intento_marca_fallido(ruta_db):
+    cola = ColaSQLite(ruta_db, max_intentos=1)
+    cola.encolar('ABC123', '1')
+
+    cola.reservar('caido', 0.1)
+    time.sleep(0.2)
+
+    assert cola.reservar('vivo', 30) is None
+    assert cola.resumen() == {'fallido': 1}
+
+
+def test_interrupcion_devuelve_el_trabajo_sin_gastar_intento(ruta_db):
+    cola = ColaSQLite(ruta_db, max_intentos=1)
+    cola.encolar('ABC123', '1')
+    cola.encolar('XYZ789', '2')
+
+    def interrumpir(placa, documento):
+        raise KeyboardInterrupt
+
+    procesados = TrabajadorDistribuido(cola, procesar=interrumpir).ejecutar()
+
+    assert procesados == 0
+    assert cola.resumen() == {'pendiente': 2}
+    assert cola.reservar('t1', 30)['intento'] == 1
+
+
+class ColaQueFallaAlCompletar(ColaSQLite):
+    """Simula un 'database is locked' en la primera llamada a completar"""
+
+    def __init__(self, ruta_db):
+        super().__init__(ruta_db)
+        self.fallos_pendientes = 1
+
+    def completar(self, trabajo_id, trabajador, datos):
+        if self.fallos_pendientes:
+            self.fallos_pendientes -= 1
+            raise sqlite3.OperationalError('database is locked')
+        return super().completar(trabajo_id, trabajador, datos)
+
+
+def test_completar_se_reintenta_tras_un_error(ruta_db):
+    cola = ColaQueFallaAlCompletar(ruta_db)
+    cola.encolar('ABC123', '1')
+    cola.encolar('XYZ789', '2')
+
+    procesados = TrabajadorDistribuido(
+        cola,
+        procesar=lambda placa, documento: {'placa': placa},
+        espera_reintento=0.01
+    ).ejecutar()
+
+    assert procesados == 2
+    assert cola.resumen() == {'completado': 2}
+    assert sorted(r['placa'] for r in cola.resultados()) == ['ABC123', 'XYZ789']
+
+
+def test_error_persistente_de_la_cola_no_detiene_al_trabajador(ruta_db):
+    cola = ColaQueFallaAlCompletar(ruta_db)
+    cola.fallos_pendientes = 3
+    cola.encolar('ABC123', '1')
+    cola.encolar('XYZ789', '2')
+
+    procesados = TrabajadorDistribuido(
+        cola,
+        procesar=lambda placa, documento: {'placa': placa},
+        espera_reintento=0.01
+    ).ejecutar()
+
+    assert procesados == 2
+    assert cola.resumen() == {'en_proceso': 1, 'completado': 1}
+
+
+def test_varios_procesos_sin_duplicados(ruta_db, tmp_path):
+    ruta_log = str(tmp_path / 'consultas.log')
+    cola = ColaSQLite(ruta_db)
+    placas = [f"AAA{i:03d}" for i in range(100)]
+    for i, placa in enumerate(placas):
+        cola.encolar(placa, str(i))
+
+    procesos = [multiprocessing.Process(target=_trabajador_en_proceso, args=(ruta_db, ruta_log))
+                for _ in range(4)]
+    for proceso in procesos:
+        proceso.start()
+    for proceso in procesos:
+        proceso.join(timeout=60)
+        assert proceso.exitcode == 0
+
+    with open(ruta_log, encoding='utf-8') as f:
+        consultadas = f.read().split()
+
+    assert sorted(consultadas) == placas
+    assert cola.resumen() == {'completado': 100}
+    assert sorted(r['placa'] for r in cola.resultados()) == placas
+
+
+def test_cola_http(ruta_db):
+    servidor = ServidorCola(ColaSQLite(ruta_db), host='127.0.0.1', puerto=0, token='secreto')
+    hilo = threading.Thread(target=servidor.servir, daemon=True)
+    hilo.start()
+    try:
+        cola = ColaHTTP(servidor.direccion, timeout=5, token='secreto')
+        assert cola.encolar('ABC123', '1')
+
+        resultado = TrabajadorDistribuido(
+            cola,
+            procesar=lambda placa, documento: {'placa': placa},
+            intervalo_latido=0.05
+        ).ejecutar()
+
+        assert resultado == 1
+        assert cola.resumen() == {'completado': 1}
+        assert cola.resultados() == [{'placa': 'ABC123'}]
+
+        with pytest.raises(RuntimeError):
+            cola._llamar('borrar_todo')
+    finally:
+        servidor.detener()
+
+
+@pytest.mark.parametrize('token', [None, 'otro'])
+def test_cola_http_rechaza_token_invalido(ruta_db, token):
+    servidor = ServidorCola(ColaSQLite(ruta_db), host='127.0.0.1', puerto=0, token='secreto')
+    hilo = threading.Thread(target=servidor.servir, daemon=True)
+    hilo.start()
+    try:
+        with pytest.raises(RuntimeError, match='No autorizado'):
+            ColaHTTP(servidor.direccion, timeout=5, token=token).encolar('ABC123', '1')
+        assert ColaSQLite(ruta_db).resumen() == {}
+    finally:
+        servidor.detener()
@@ -0,0 +1,46 @@
+from extractor_html import extraer_datos_html, limpiar_documento, lineas_texto
+
+
+def test_une_elementos_en_linea():
+    html = ('<html><body><div><label>PLACA DEL VEHÍCULO:</label> <span>ABC</span><b>123</b></div>'
+            '<div><label>MARCA:</label><div>RENAULT</div></div></body></html>')
+    datos = extraer_datos_html(html)
+    assert datos['placa'] == 'ABC123'
+    assert datos['marca'] == 'RENAULT'
+
+
+def test_omite_texto_oculto_y_paneles_colapsados():
+    html = (
+        '<html><body>'
+        '<div hidden>MARCA:</div><div aria-hidden="true">CHEVROLET</div>'
+        '<div style="display: none">MARCA</div>'
+        '<mat-expansion-panel><mat-expansion-panel-header aria-expanded="false">'
+        '<mat-panel-title>Datos técnicos</mat-panel-title></mat-expansion-panel-header>'
+        '<div>MARCA</div><div>MAZDA</div></mat-expansion-panel>'
+        '<div>MARCA</div><div>KIA</div>'
+        '</body></html>'
+    )
+    body = limpiar_documento(html).find('body')
+    assert lineas_texto(body) == ['CHEVROLET', 'Datos técnicos', 'MARCA', 'KIA']
+    assert extraer_datos_html(html)['marca'] == 'KIA'
+
+
+def test_conserva_texto_aria_hidden_como_selenium():
+    html = ('<html><body><div><label>ESTADO DEL VEHÍCULO:</label>'
+            '<div><mat-icon aria-hidden="true">check_circle</mat-icon> ACTIVO</div></div></body></html>')
+    assert extraer_datos_html(html)['estado_vehiculo'] == 'check_circle ACTIVO'
+
+
+def test_fecha_soat_del_panel_expandido():
+    html = (
+        '<html><body><mat-card><mat-card-title>Póliza SOAT</mat-card-title>'
+        '<mat-card-content><p><strong>Fecha fin de vigencia:</strong> 14/03/2025</p></mat-card-content>'
+        '</mat-card></body></html>'
+    )
+    assert extraer_datos_html(html)['soat_fecha_fin_vigencia'] == '14/03/2025'
+
+
+def test_acepta_str_con_declaracion_xml_y_bytes_utf8():
+    html = '<?xml version="1.0" encoding="utf-8"?><html><body><p>CLASE DE VEHÍCULO</p><p>AUTOMÓVIL</p></body></html>'
+    assert extraer_datos_html(html)['clase_vehiculo'] == 'AUTOMÓVIL'
+    assert extraer_datos_html(html.encode('utf-8'))['clase_vehiculo'] == 'AUTOMÓVIL'
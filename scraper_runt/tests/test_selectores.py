@@ -0,0 +1,65 @@
+import pytest
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
+from selenium.webdriver.common.by import By
+
+from selectores import RegistroSelectores
+
+
+PREFERIDA = (By.XPATH, "//preferida")
+ALTERNATIVA = (By.XPATH, "//alternativa")
+
+
+class ElementoFalso:
+    def __init__(self, valor):
+        self.valor = valor
+
+
+class DriverFalso:
+    """Solo encuentra los locators de `presentes` y cuenta las búsquedas"""
+
+    def __init__(self, presentes):
+        self.presentes = set(presentes)
+        self.busquedas = []
+
+    def find_element(self, by, valor):
+        self.busquedas.append(valor)
+        if valor in self.presentes:
+            return ElementoFalso(valor)
+        raise NoSuchElementException(valor)
+
+
+@pytest.fixture
+def registro():
+    return RegistroSelectores({'boton': [PREFERIDA, ALTERNATIVA]}, timeout=0.3, intervalo=0.05, revalidar_cada=3)
+
+
+def test_prueba_primero_la_ultima_ganadora(registro):
+    driver = DriverFalso([ALTERNATIVA[1]])
+    registro.buscar(driver, 'boton')
+    driver.busquedas.clear()
+
+    assert registro.buscar(driver, 'boton').valor == ALTERNATIVA[1]
+    assert driver.busquedas == [ALTERNATIVA[1]]
+
+
+def test_vuelve_a_la_estrategia_preferida(registro):
+    driver = DriverFalso([ALTERNATIVA[1]])
+    registro.buscar(driver, 'boton')
+    assert registro.resumen()['boton']['ganador'] == ALTERNATIVA[1]
+
+    driver.presentes.add(PREFERIDA[1])
+    encontrados = [registro.buscar(driver, 'boton').valor for _ in range(3)]
+
+    assert PREFERIDA[1] in encontrados
+    assert registro.resumen()['boton']['ganador'] == PREFERIDA[1]
+    assert registro.buscar(driver, 'boton').valor == PREFERIDA[1]
+
+
+def test_timeout_registra_fallo(registro):
+    with pytest.raises(TimeoutException):
+        registro.buscar(DriverFalso([]), 'boton')
+
+    estadisticas = registro.resumen()['boton']
+    assert estadisticas['fallos'] == 1
+    assert estadisticas['exitos'] == 0
+    assert estadisticas['tiempo_max'] < 1